@@ -3,6 +3,7 @@
 
 import os
 import sys
+import threading
 import tkinter as tk
 from tkinter import filedialog, messagebox, ttk
 
@@ -53,8 +54,8 @@ class StatisticsApp:
         global_cb.grid(row=2, column=1, padx=10, pady=5, sticky="w")
         
         # Calculate button
-        calc_btn = ttk.Button(self.root, text="Calculate", command=self.calculate)
-        calc_btn.pack(padx=10, pady=10)
+        self.calc_btn = ttk.Button(self.root, text="Calculate", command=self.calculate)
+        self.calc_btn.pack(padx=10, pady=10)
         
         # Message area
         message_frame = ttk.LabelFrame(self.root, text="Message Content")
@@ -81,31 +82,54 @@ class StatisticsApp:
             messagebox.showerror("Error", "Please select at least one calculation option.")
             return
         
+        # Run the reading and calculations off the Tk main loop so the window stays responsive
+        self.calc_btn.config(state="disabled")
+        self.message_text.delete(1.0, tk.END)
+        self.message_text.insert(tk.END, "Calculating...")
+        
+        threading.Thread(
+            target=self._run_compute,
+            args=(self.selected_folder, selected_operations, self.global_var.get()),
+            daemon=True
+        ).start()
+    
+    def _run_compute(self, folder, operations, use_global):
+        # Runs on a worker thread; Tk widgets are only updated via root.after on the main thread
         try:
             # Read measurement files
-            measurement_files = FileReader.scan_directory(self.selected_folder)
+            measurement_files = FileReader.scan_directory(folder)
             
             # Process calculations
-            processor = CalculationProcessor(self.selected_folder)
+            processor = CalculationProcessor(folder)
             result = processor.process_calculations(
                 measurement_files, 
-                selected_operations,
-                self.global_var.get()
+                operations,
+                use_global
             )
-            
-            # Display result message
-            self.message_text.delete(1.0, tk.END)
-            self.message_text.insert(tk.END, result["message"])
-            
-            if result["status"] == "Success":
-                messagebox.showinfo("Success", "Calculations completed successfully.")
-            else:
-                messagebox.showerror("Error", result["message"])
-                
         except Exception as e:
-            messagebox.showerror("Error", f"An error occurred: {str(e)}")
-            self.message_text.delete(1.0, tk.END)
-            self.message_text.insert(tk.END, f"An error occurred: {str(e)}")
+            self.root.after(0, self._show_error, e)
+            return
+        
+        self.root.after(0, self._show_result, result)
+    
+    def _show_result(self, result):
+        self.calc_btn.config(state="normal")
+        
+        # Display result message
+        self.message_text.delete(1.0, tk.END)
+        self.message_text.insert(tk.END, result["message"])
+        
+        if result["status"] == "Success":
+            messagebox.showinfo("Success", "Calculations completed successfully.")
+        else:
+            messagebox.showerror("Error", result["message"])
+    
+    def _show_error(self, error):
+        self.calc_btn.config(state="normal")
+        
+        messagebox.showerror("Error", f"An error occurred: {str(error)}")
+        self.message_text.delete(1.0, tk.END)
+        self.message_text.insert(tk.END, f"An error occurred: {str(error)}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,82 @@
+import importlib.util
+import math
+import threading
+
+# numba is optional; without it the callers fall back to plain NumPy reductions
+NUMBA_AVAILABLE = importlib.util.find_spec('numba') is not None
+
+# Below this many values NumPy's reductions are as fast as the compiled kernel,
+# so smaller arrays never pay for importing numba and loading the kernel
+KERNEL_MIN_VALUES = 10_000_000
+
+_compiled_fused_moments = None
+_compile_lock = threading.Lock()
+
+
+def get_fused_moments():
+    """
+    Return the compiled fused_moments kernel, or None if numba is not installed
+    numba is imported and the kernel compiled (or loaded from its on-disk cache) on the first call only
+    """
+    global _compiled_fused_moments
+    if not NUMBA_AVAILABLE:
+        return None
+    
+    with _compile_lock:
+        if _compiled_fused_moments is None:
+            from numba import njit
+            
+            # fastmath without the no-NaN/no-Inf assumptions: reassociation is what lets
+            # LLVM vectorise the accumulations, while NaN values still propagate into the sums.
+            # nogil lets several threads run the kernel on different arrays in parallel
+            _compiled_fused_moments = njit(
+                cache=True, nogil=True, fastmath={'reassoc', 'contract', 'nsz'}, boundscheck=False
+            )(fused_moments)
+    return _compiled_fused_moments
+
+
+def fused_moments(values):
+    """
+    Walk a non-empty float64 array once, accumulating mean, sum of squared deviations, minimum and maximum
+    Returns them as a (mean, squared_deviations, minimum, maximum) tuple
+    Plain Python as written; get_fused_moments returns the compiled version
+    """
+    # Sums are taken around the first value rather than zero, so the squared
+    # deviations don't cancel out for values with a large offset
+    pivot = values[0]
+    total = 0.0
+    sum_squares = 0.0
+    minimum = values[0]
+    maximum = values[0]
+    for i in range(values.size):
+        value = values[i]
+        deviation = value - pivot
+        total += deviation
+        sum_squares += deviation * deviation
+        minimum = min(minimum, value)
+        maximum = max(maximum, value)
+    
+    # Infinite or NaN values leave the pivoted sum non-finite even where NumPy's mean is
+    # not, e.g. an infinite pivot; redo these rare inputs as plain two-pass sums like
+    # NumPy's. Checking outside the main loop keeps it free of branches, so it stays vectorised
+    if not math.isfinite(total):
+        total = 0.0
+        has_nan = False
+        for i in range(values.size):
+            total += values[i]
+            has_nan = has_nan or math.isnan(values[i])
+        mean = total / values.size
+        
+        squared_deviations = 0.0
+        for i in range(values.size):
+            deviation = values[i] - mean
+            squared_deviations += deviation * deviation
+        
+        # min() and max() skip NaN values; propagate them like ndarray.min()/max()
+        if has_nan:
+            minimum = math.nan
+            maximum = math.nan
+        return mean, squared_deviations, minimum, maximum
+    
+    offset = total / values.size
+    return pivot + offset, sum_squares - total * offset, minimum, maximum
\ No newline at end of file
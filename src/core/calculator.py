@@ -1,8 +1,24 @@
-import statistics
 import os
 import math
 from abc import ABC, abstractmethod
-from collections import Counter
+
+import numpy as np
+
+from src.core._kernels import KERNEL_MIN_VALUES, get_fused_moments
+
+
+def _as_array(values):
+    """Return values as a float64 NumPy array (no copy if it already is one)"""
+    return np.asarray(values, dtype=np.float64)
+
+
+def _fmt_num(x):
+    """Format a result with no decimal places if it's a whole number, otherwise with two"""
+    try:
+        whole = int(x)
+    except (OverflowError, ValueError):  # inf / nan
+        return f"{x:.2f}"
+    return str(whole) if x == whole else f"{x:.2f}"
 
 class StatisticsStrategy(ABC):
     """
@@ -28,69 +44,88 @@ class StatisticsStrategy(ABC):
 class AverageStrategy(StatisticsStrategy):
     """Strategy for calculating average/mean"""
     def calculate(self, values):
-        if not values:
+        values = _as_array(values)
+        if values.size == 0:
             return 0
-        return sum(values) / len(values)
+        return values.mean()
     
     def get_name(self):
         return "average"
     
     def format_result(self, result):
-        # Format with no decimal places if it's a whole number
-        return f"avg: {result if result == int(result) else result:.2f}"
+        return f"avg: {_fmt_num(result)}"
 
 
 class MaximumStrategy(StatisticsStrategy):
     """Strategy for finding maximum value"""
     def calculate(self, values):
-        if not values:
+        values = _as_array(values)
+        if values.size == 0:
             return 0
-        return max(values)
+        return values.max()
     
     def get_name(self):
         return "maximum"
     
     def format_result(self, result):
-        # Format with no decimal places if it's a whole number
-        return f"max: {result if result == int(result) else result:.2f}"
+        return f"max: {_fmt_num(result)}"
 
 
 class MinimumStrategy(StatisticsStrategy):
     """Strategy for finding minimum value"""
     def calculate(self, values):
-        if not values:
+        values = _as_array(values)
+        if values.size == 0:
             return 0
-        return min(values)
+        return values.min()
     
     def get_name(self):
         return "minimum"
     
     def format_result(self, result):
-        # Format with no decimal places if it's a whole number
-        return f"min: {result if result == int(result) else result:.2f}"
+        return f"min: {_fmt_num(result)}"
 
 
 class StandardDeviationStrategy(StatisticsStrategy):
     """Strategy for calculating standard deviation"""
     def calculate(self, values):
-        if len(values) < 2:
+        values = _as_array(values)
+        if values.size < 2:
             return 0
-        return statistics.stdev(values)
+        return float(np.std(values, ddof=1))
     
     def get_name(self):
         return "standarddeviation"
     
     def format_result(self, result):
-        # Format with no decimal places if it's a whole number
-        return f"std: {result if result == int(result) else result:.2f}"
+        return f"std: {_fmt_num(result)}"
+
+
+# Decimal places frequency values are rounded to per measurement type, so noisy
+# readings fall into a manageable number of bins instead of nearly unique keys
+ROUND_DECIMALS = {'temperature': 1, 'humidity': 0}
+
+
+def round_for_frequency(values, measurement_type):
+    """Round values to the frequency bin width of their measurement type (unchanged for other types)"""
+    decimals = ROUND_DECIMALS.get(measurement_type)
+    if decimals is None:
+        return values
+    # Round halves up rather than to even (as np.round does), so every bin covers
+    # the same [x - half, x + half) range of readings
+    scale = 10.0 ** decimals
+    return np.floor(_as_array(values) * scale + 0.5) / scale
 
 
 class FrequencyStrategy(StatisticsStrategy):
     """Strategy for calculating frequency of values"""
     def calculate(self, values):
-        if not values:
+        values = _as_array(values)
+        if values.size == 0:
             return {}
-        return dict(Counter(values))
+        # np.unique sorts the values, so the dict is already ordered by value
+        unique_values, counts = np.unique(values, return_counts=True)
+        return dict(zip(unique_values.tolist(), counts.tolist()))
     
     def get_name(self):
         return "frequency"
@@ -99,7 +134,7 @@ class FrequencyStrategy(StatisticsStrategy):
         # This will be overridden by the measurement-type specific formatting
         # in the ResultWriter class
         formatted = []
-        for value, count in sorted(result.items()):
+        for value, count in result.items():
             formatted.append(f"{value} {count} defa ölçüldü")
         return "\n".join(formatted)
 
@@ -107,16 +142,137 @@ class FrequencyStrategy(StatisticsStrategy):
 class MedianStrategy(StatisticsStrategy):
     """Strategy for calculating median"""
     def calculate(self, values):
-        if not values:
+        values = _as_array(values)
+        if values.size == 0:
             return 0
-        return statistics.median(values)
+        return float(np.median(values))
     
     def get_name(self):
         return "median"
     
     def format_result(self, result):
-        # Format with no decimal places if it's a whole number
-        return f"median: {result if result == int(result) else result:.2f}"
+        return f"median: {_fmt_num(result)}"
+
+
+# Strategy names whose results fused_reductions can compute together
+FUSABLE_REDUCTIONS = ('average', 'standarddeviation', 'minimum', 'maximum', 'median')
+
+# The subset derived from count, mean, sum of squared deviations, minimum and maximum
+# alone, which can therefore also be combined across files from partial_moments
+MOMENT_REDUCTIONS = ('average', 'standarddeviation', 'minimum', 'maximum')
+
+
+def partial_moments(values):
+    """
+    Compute (count, mean, sum of squared deviations from the mean, minimum, maximum) of values
+    These partial results can be combined across files with combine_moments
+    """
+    values = _as_array(values)
+    n = values.size
+    if n == 0:
+        return 0, 0.0, 0.0, math.inf, -math.inf
+    
+    # One compiled pass over the values gives all the moments at once, which only
+    # pays off over NumPy's separate reductions for large arrays
+    fused_moments = get_fused_moments() if n >= KERNEL_MIN_VALUES else None
+    if fused_moments is not None:
+        mean, squared_deviations, minimum, maximum = fused_moments(values)
+    else:
+        mean = values.mean()
+        # Squares of the deviations rather than of the values, as np.std does, so the
+        # spread of values far from zero is not lost to cancellation
+        deviations = values - mean
+        squared_deviations = np.dot(deviations, deviations)
+        minimum = values.min()
+        maximum = values.max()
+    return n, mean, squared_deviations, minimum, maximum
+
+
+def combine_moments(partials, names):
+    """
+    Combine the partial_moments of several arrays into the requested reductions
+    over all of their values, without concatenating them
+    Returns a dict mapping each requested strategy name to its result
+    """
+    n = 0
+    mean = 0.0
+    squared_deviations = 0.0
+    minimum = math.inf
+    maximum = -math.inf
+    for count, partial_mean, partial_squared_deviations, partial_minimum, partial_maximum in partials:
+        if count == 0:
+            continue
+        combined = n + count
+        if math.isfinite(mean) and math.isfinite(partial_mean):
+            # Chan et al.'s pairwise update: merging means and squared deviations
+            # directly avoids the cancellation of summing raw squares
+            delta = partial_mean - mean
+            mean += delta * count / combined
+            squared_deviations += partial_squared_deviations + delta * delta * n * count / combined
+        else:
+            # The delta of an infinite or NaN mean is meaningless (inf - inf), so weight the
+            # means as plain sums instead; like np.mean over all values this keeps inf,
+            # and the deviations from such a mean are NaN as in np.std
+            mean = (mean * n + partial_mean * count) / combined
+            squared_deviations = math.nan
+        n = combined
+        # np.minimum/np.maximum propagate NaN like ndarray.min()/max(), unlike the builtins
+        minimum = np.minimum(minimum, partial_minimum)
+        maximum = np.maximum(maximum, partial_maximum)
+    
+    if n == 0:
+        return {name: 0 for name in names}
+    return _moment_results(n, mean, squared_deviations, minimum, maximum, names)
+
+
+def _moment_results(n, mean, squared_deviations, minimum, maximum, names):
+    """Derive the requested moment reductions of n (> 0) values from their partial moments"""
+    results = {}
+    if 'minimum' in names:
+        results['minimum'] = minimum
+    if 'maximum' in names:
+        results['maximum'] = maximum
+    if 'average' in names:
+        results['average'] = mean
+    if 'standarddeviation' in names:
+        if n < 2:
+            results['standarddeviation'] = 0
+        else:
+            variance = squared_deviations / (n - 1)
+            results['standarddeviation'] = math.sqrt(max(variance, 0.0))
+    return results
+
+
+def fused_reductions(values, names):
+    """
+    Compute several reductions over the same values together
+    Mean, squared deviations, minimum and maximum come from partial_moments, and the
+    median uses a partial sort instead of a full one
+    Returns a dict mapping each requested strategy name to its result
+    """
+    values = _as_array(values)
+    n = values.size
+    if n == 0:
+        return {name: 0 for name in names}
+    
+    if any(name in MOMENT_REDUCTIONS for name in names):
+        results = _moment_results(*partial_moments(values), names)
+    else:
+        results = {}
+    
+    if 'median' in names:
+        middle = n // 2
+        # The last position is partitioned too, as np.median does: NaN sorts last,
+        # so a NaN there makes the median NaN like MedianStrategy's
+        if n % 2:
+            partitioned = np.partition(values, (middle, -1))
+            median = partitioned[middle]
+        else:
+            partitioned = np.partition(values, (middle - 1, middle, -1))
+            median = (partitioned[middle - 1] + partitioned[middle]) / 2
+        results['median'] = math.nan if np.isnan(partitioned[-1]) else float(median)
+    
+    return results
 
 
 class CalculatorContext:
@@ -136,6 +292,17 @@ class CalculatorContext:
         return None
 
 
+# Strategies are stateless, so a single shared instance of each is enough
+_CALCULATORS = {
+    'average': AverageStrategy(),
+    'maximum': MaximumStrategy(),
+    'minimum': MinimumStrategy(),
+    'standard_deviation': StandardDeviationStrategy(),
+    'frequency': FrequencyStrategy(),
+    'median': MedianStrategy()
+}
+
+
 class CalculatorFactory:
     """
     Factory class for creating calculators
@@ -143,16 +310,7 @@ class CalculatorFactory:
     """
     @staticmethod
     def create_calculator(calculation_type):
-        calculators = {
-            'average': AverageStrategy(),
-            'maximum': MaximumStrategy(),
-            'minimum': MinimumStrategy(),
-            'standard_deviation': StandardDeviationStrategy(),
-            'frequency': FrequencyStrategy(),
-            'median': MedianStrategy()
-        }
-        
-        return calculators.get(calculation_type.lower())
+        return _CALCULATORS.get(calculation_type.lower())
 
 
 class ResultWriter:
@@ -161,59 +319,52 @@ class ResultWriter:
     """
     @staticmethod
     def write_file_result(output_dir, measurement_type, strategy, file_results):
-        """Write results for individual files"""
-        os.makedirs(output_dir, exist_ok=True)
-        
-        # Create directory for measurement type if it doesn't exist
+        """Write results for individual files (the measurement type directory must already exist)"""
         measurement_dir = os.path.join(output_dir, measurement_type)
-        os.makedirs(measurement_dir, exist_ok=True)
         
         # Write results to file
         filename = f"{strategy.get_name()}degerler.txt"
         file_path = os.path.join(measurement_dir, filename)
         
+        # Build the whole file in memory and write it with a single call
+        chunks = []
+        measurement_unit = ResultWriter._get_measurement_unit(measurement_type)
+        
+        for file_obj, result in file_results:
+            file_metadata = ResultWriter._format_file_metadata(file_obj)
+            if isinstance(result, dict):  # For frequency results
+                chunks.append(f"{file_metadata}\n")
+                chunks.append(ResultWriter._format_frequency(result, measurement_unit))
+                chunks.append("\n---------------\n")
+            else:
+                chunks.append(f"{file_metadata} , {strategy.format_result(result)}\n")
+        
         with open(file_path, 'w', encoding='utf-8') as f:
-            for file_obj, result in file_results:
-                if isinstance(result, dict):  # For frequency results
-                    f.write(f"{ResultWriter._format_file_metadata(file_obj)}\n")
-                    
-                    # Format frequency results with appropriate unit based on measurement type
-                    formatted = []
-                    measurement_unit = ResultWriter._get_measurement_unit(measurement_type)
-                    
-                    for value, count in sorted(result.items()):
-                        formatted.append(f"{value} {measurement_unit} {count} defa ölçüldü")
-                    
-                    f.write("\n".join(formatted))
-                    f.write("\n---------------\n")
-                else:
-                    f.write(f"{ResultWriter._format_file_metadata(file_obj)} , {strategy.format_result(result)}\n")
+            f.write("".join(chunks))
     
     @staticmethod
     def write_global_result(output_dir, measurement_type, strategy, result):
-        """Write global calculation results"""
-        os.makedirs(output_dir, exist_ok=True)
-        
-        # Create directory for measurement type if it doesn't exist
+        """Write global calculation results (the measurement type directory must already exist)"""
         measurement_dir = os.path.join(output_dir, measurement_type)
-        os.makedirs(measurement_dir, exist_ok=True)
         
         # Write results to file
         filename = f"global{strategy.get_name()}.txt"
         file_path = os.path.join(measurement_dir, filename)
         
+        if isinstance(result, dict):  # For frequency results
+            content = ResultWriter._format_frequency(
+                result, ResultWriter._get_measurement_unit(measurement_type)
+            )
+        else:
+            content = strategy.format_result(result)
+        
         with open(file_path, 'w', encoding='utf-8') as f:
-            if isinstance(result, dict):  # For frequency results
-                # Format frequency results with appropriate unit based on measurement type
-                formatted = []
-                measurement_unit = ResultWriter._get_measurement_unit(measurement_type)
-                
-                for value, count in sorted(result.items()):
-                    formatted.append(f"{value} {measurement_unit} {count} defa ölçüldü")
-                
-                f.write("\n".join(formatted))
-            else:
-                f.write(strategy.format_result(result))
+            f.write(content)
+    
+    @staticmethod
+    def _format_frequency(result, measurement_unit):
+        """Format frequency results with the unit of the measurement type, one value per line"""
+        return "\n".join(f"{value} {measurement_unit} {count} defa ölçüldü" for value, count in result.items())
     
     @staticmethod
     def _format_file_metadata(file_obj):
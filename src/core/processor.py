@@ -1,5 +1,22 @@
 import os
-from src.core.calculator import CalculatorFactory, CalculatorContext, ResultWriter
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from src.core.calculator import (
+    FUSABLE_REDUCTIONS, MOMENT_REDUCTIONS, CalculatorFactory, CalculatorContext, ResultWriter,
+    combine_moments, fused_reductions, partial_moments, round_for_frequency
+)
+
+# Per-file results keyed by (file path, source version, calculation name), where the source
+# version is the (modification time, size) recorded when the file's values were read.
+# Least recently used first, so the oldest entry is evicted when the cache is full
+_FILE_RESULT_CACHE = OrderedDict()
+_FILE_RESULT_CACHE_SIZE = 2048
+
+# Global moments are computed on a thread pool once a measurement type has this many values
+_PARALLEL_MIN_VALUES = 1_000_000
 
 class CalculationProcessor:
     """
@@ -23,7 +40,6 @@ class CalculationProcessor:
         Returns:
             Dictionary with results and status message
         """
-        results = {}
         status = "Success"
         
         try:
@@ -32,23 +48,31 @@ class CalculationProcessor:
                 if not files:
                     continue
                 
-                # Process each requested operation
+                # Create the output directory for this measurement type once for all writers
+                os.makedirs(os.path.join(self.output_directory, measurement_type), exist_ok=True)
+                
+                # Resolve the requested operations to strategies
+                strategies = []
                 for operation in operations:
                     strategy = CalculatorFactory.create_calculator(operation)
-                    if not strategy:
-                        continue
-                    
-                    self.calculator_context.set_strategy(strategy)
-                    
-                    # Calculate for each file
-                    file_results = []
-                    for file_obj in files:
-                        values = file_obj.get_values()
-                        if values:
-                            result = self.calculator_context.calculate(values)
-                            file_results.append((file_obj, result))
+                    if strategy:
+                        strategies.append(strategy)
+                
+                # Calculate every requested statistic of each file together,
+                # so reductions over the same values are done in one go
+                per_file_results = []
+                for file_obj in files:
+                    values = file_obj.get_values()
+                    if len(values):
+                        per_file_results.append((file_obj, self._calculate_file(file_obj, measurement_type, strategies, values)))
+                
+                global_results = self._calculate_global(files, measurement_type, strategies) if use_global else None
+                
+                for strategy in strategies:
+                    name = strategy.get_name()
                     
                     # Write individual file results
+                    file_results = [(file_obj, file_result_map[name]) for file_obj, file_result_map in per_file_results]
                     ResultWriter.write_file_result(
                         self.output_directory, 
                         measurement_type,
@@ -56,21 +80,14 @@ class CalculationProcessor:
                         file_results
                     )
                     
-                    # Calculate and write global results if requested
-                    if use_global:
-                        # Combine all values from all files for global calculation
-                        all_values = []
-                        for file_obj in files:
-                            all_values.extend(file_obj.get_values())
-                        
-                        if all_values:
-                            global_result = self.calculator_context.calculate(all_values)
-                            ResultWriter.write_global_result(
-                                self.output_directory,
-                                measurement_type,
-                                strategy,
-                                global_result
-                            )
+                    # Write global results if requested
+                    if global_results is not None:
+                        ResultWriter.write_global_result(
+                            self.output_directory,
+                            measurement_type,
+                            strategy,
+                            global_results[name]
+                        )
             
             message = f"The calculations were successfully performed. Folder containing results: {self.output_directory}"
             
@@ -81,4 +98,81 @@ class CalculationProcessor:
         return {
             "status": status,
             "message": message
-        } 
\ No newline at end of file
+        }
+    
+    def _calculate_file(self, file_obj, measurement_type, strategies, values):
+        """
+        Calculate the given strategies for a single file
+        Results are reused on later runs as long as the values were read from the same version of the file
+        Returns a dict mapping each strategy name to its result
+        """
+        version = file_obj.source_version
+        if version is None:
+            return self._calculate_values(values, measurement_type, strategies)
+        
+        results = {}
+        missing = []
+        for strategy in strategies:
+            key = (file_obj.file_path, version, strategy.get_name())
+            if key in _FILE_RESULT_CACHE:
+                _FILE_RESULT_CACHE.move_to_end(key)
+                results[strategy.get_name()] = _FILE_RESULT_CACHE[key]
+            else:
+                missing.append(strategy)
+        
+        for name, result in self._calculate_values(values, measurement_type, missing).items():
+            results[name] = result
+            _FILE_RESULT_CACHE[(file_obj.file_path, version, name)] = result
+            if len(_FILE_RESULT_CACHE) > _FILE_RESULT_CACHE_SIZE:
+                _FILE_RESULT_CACHE.popitem(last=False)
+        return results
+    
+    def _calculate_global(self, files, measurement_type, strategies):
+        """
+        Calculate the given strategies over the values of all files together
+        Moment reductions are combined from per-file partial results, computed in parallel
+        for large datasets; only the other strategies need the concatenated values
+        Returns a dict mapping each strategy name to its result, or None if there are no values
+        """
+        arrays = [file_obj.get_values() for file_obj in files]
+        total_values = sum(len(values) for values in arrays)
+        if not total_values:
+            return None
+        
+        results = {}
+        moment_names = [strategy.get_name() for strategy in strategies
+                        if strategy.get_name() in MOMENT_REDUCTIONS]
+        if moment_names:
+            if total_values >= _PARALLEL_MIN_VALUES and len(arrays) > 1:
+                # NumPy and the compiled kernel release the GIL, so threads run in parallel
+                with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+                    partials = list(executor.map(partial_moments, arrays))
+            else:
+                partials = [partial_moments(values) for values in arrays]
+            results.update(combine_moments(partials, moment_names))
+        
+        remaining = [strategy for strategy in strategies if strategy.get_name() not in results]
+        if remaining:
+            results.update(self._calculate_values(np.concatenate(arrays), measurement_type, remaining))
+        return results
+    
+    def _calculate_values(self, values, measurement_type, strategies):
+        """
+        Calculate the given strategies on the same values
+        When more than one reduction is requested they are computed together by fused_reductions
+        Returns a dict mapping each strategy name to its result
+        """
+        fused_names = [strategy.get_name() for strategy in strategies
+                       if strategy.get_name() in FUSABLE_REDUCTIONS]
+        results = fused_reductions(values, fused_names) if len(fused_names) >= 2 else {}
+        
+        for strategy in strategies:
+            name = strategy.get_name()
+            if name not in results:
+                self.calculator_context.set_strategy(strategy)
+                if name == 'frequency':
+                    # Frequencies are counted over values rounded to the bin width of the measurement type
+                    results[name] = self.calculator_context.calculate(round_for_frequency(values, measurement_type))
+                else:
+                    results[name] = self.calculator_context.calculate(values)
+        return results
\ No newline at end of file
@@ -1,30 +1,31 @@
-class Measurement:
-    """
-    Class to represent a single measurement from a file
-    """
-    def __init__(self, time, value):
-        self.time = time
-        self.value = float(value)
+import numpy as np
 
-    def __str__(self):
-        return f"{self.time}: {self.value}"
 
 class MeasurementFile:
     """
-    Class to represent a measurement file, containing metadata and measurements
+    Class to represent a measurement file, containing metadata and measurement values
     """
     def __init__(self, file_path, metadata=None):
         self.file_path = file_path
         self.metadata = metadata or {}
-        self.measurements = []
+        # Values as a float64 NumPy array, parsed in bulk by the file reader;
+        # the time column is not kept since no calculation uses it
+        self._values = np.empty(0, dtype=np.float64)
+        # (modification time in ns, size) of the source file when the values were read,
+        # identifying that version of the file; None if unknown
+        self.source_version = None
         
-    def add_measurement(self, measurement):
-        """Add a measurement to this file's data"""
-        self.measurements.append(measurement)
+    def set_values(self, values, source_stat=None):
+        """
+        Replace this file's data with an already parsed float64 array of values
+        source_stat is the os.stat_result of the source file taken before the values were read
+        """
+        self._values = values
+        self.source_version = None if source_stat is None else (source_stat.st_mtime_ns, source_stat.st_size)
         
     def get_values(self):
-        """Return a list of all measurement values"""
-        return [m.value for m in self.measurements]
+        """Return all measurement values (float64 NumPy array)"""
+        return self._values
         
     def __str__(self):
         return f"{self.metadata.get('id', 'unknown')} - {self.metadata.get('type', 'unknown')}" 
\ No newline at end of file